@@ -57,8 +57,11 @@ except (ValueError, TypeError):
 
 import sys
 import math
+import heapq
+import bisect
+import functools
+from fractions import Fraction
 import platform
-import argparse
 
 # ---------- 命令行模式检测 ----------
 USE_CLI = False
@@ -119,8 +122,8 @@ if not USE_CLI:
 
 # ---------- 2. 核心算法 ----------
 # ？？？？（ ？？？？？？？ ？？？？）
-EE_msg_codes = [20320, 26159, 22312, 25214, 66, 85, 71, 21527, 65292, 20146, 29233, 30340, 65311]
-EE_msg = ''.join(chr(c) for c in EE_msg_codes)
+# 原码点：[20320, 26159, 22312, 25214, 66, 85, 71, 21527, 65292, 20146, 29233, 30340, 65311]
+EE_msg = "你是在找BUG吗，亲爱的？"
 
 def format_error(err):
     """格式化误差显示（CLI和GUI共用）"""
@@ -131,62 +134,155 @@ def format_error(err):
     else:
         return f"≈{err:.8f}"
 
+# 一位数比例的候选集是固定的 9×9 互质网格，启动时构建一次并按比值排序，
+# 运行时只需二分查找离 target 最近的一项（分母仍受 MAX_DENOMINATOR 约束）
+_SD_TABLE = sorted(
+    {(n, d) for n in range(1, 10)
+            for d in range(1, min(9, MAX_DENOMINATOR) + 1)
+            if math.gcd(n, d) == 1},
+    key=lambda t: t[0] / t[1],
+)
+_SD_VALUES = [n / d for n, d in _SD_TABLE]
+
+# 结果只由 (a, b) 和两个模块级常量决定，缓存可直接复用：
+# GUI 重复点击"运算"或 CLI 反复输入同一比例时，查表即可返回
+@functools.lru_cache(maxsize=512)
 def approximate_top5(a: int, b: int):
-    """返回 (mode, top5_list)"""
+    """返回 (mode, top5_tuple)"""
+    # 先约分：1920:1080 和 16:9 是同一个搜索问题，
+    # 缩小整数规模还能提高 target 的浮点精度
+    g = math.gcd(a, b)
+    a, b = a // g, b // g
+
+    # 退化情形直接给出精确答案，跳过整个下降过程：
+    # a==b（约分后为 1:1）或一方是另一方的倍数（约分后某一项为 1）
+    if b == 1:
+        return None, ((a, 1, 0.0),)
+    if a == 1 and b <= MAX_DENOMINATOR:
+        return None, ((1, b, 0.0),)
+
     target = a / b
-    candidates = []
-    single_digit_candidates = []
-
-    # 收集正常候选
-    for den in range(1, MAX_DENOMINATOR + 1):
-        num = round(target * den)
-        if num == 0:
-            continue
-        if math.gcd(num, den) != 1:
-            continue
-            
-        err = abs(num / den - target)
-        candidates.append((num, den, err))
-        
-        # 筛选一位数比例
-        if 1 <= num <= 9 and 1 <= den <= 9:
-            single_digit_candidates.append((num, den, err))
 
-    # ========== 极限模式：找不到任何候选时的处理 ==========
-    if not candidates:
+    # ========== 极限模式：整个搜索范围内都凑不出非零分子时的处理 ==========
+    # （等价于旧版线性扫描"候选列表为空"的情形）
+    if round(target * MAX_DENOMINATOR) == 0:
         # 比例<1：锁定分子为1，分母 = round(b/a)
         if a < b:
             extreme_den = max(1, round(b / a))
             extreme_err = abs(1/extreme_den - target)
-            return "limit_small", [(1, extreme_den, extreme_err)]
+            return "limit_small", ((1, extreme_den, extreme_err),)
         # 比例>1：锁定分母为1，分子 = round(a/b)
         else:
             extreme_num = max(1, round(a / b))
             extreme_err = abs(extreme_num/1 - target)
-            return "limit_large", [(extreme_num, 1, extreme_err)]
+            return "limit_large", ((extreme_num, 1, extreme_err),)
+
+    # 把循环内反复用到的全局名预先绑定为局部引用（LOAD_FAST 更快）
+    max_den = MAX_DENOMINATOR
+
+    # 候选改用平行数组（SoA）存放：中位分数的分母每步严格递增，
+    # 下降步数不超过 max_den，加上两个种子即是容量上限，可一次性预分配。
+    # 循环内只写下标，不打包三元组；前5名选出后才物化成元组。
+    # （不用 array.array('q')：极大输入的交叉乘积会超出64位范围）
+    cap = max_den + 2
+    nums = [0] * cap
+    dens = [0] * cap
+    errs = [0.0] * cap
+    crosses = [0] * cap
+    cnt = 0
+
+    def record(num, den):
+        # 整数交叉乘积：|num/den - a/b| = |num*b - den*a| / (den*b)，
+        # cross 是精确排序键的分子，浮点 err 仅用于展示
+        nonlocal cnt
+        cross = abs(num * b - den * a)
+        nums[cnt] = num
+        dens[cnt] = den
+        errs[cnt] = cross / (den * b)
+        crosses[cnt] = cross
+        cnt += 1
+
+    # 沿 Stern-Brocot 树向 target 批量下降收集候选：
+    # 树上的中位分数天然互质（无需 gcd 约分检查），
+    # 且每一层都是该分母范围内对 target 的最佳有理逼近。
+    # 同方向的连续中位步一次算完（步数即对应的连分数系数），
+    # 偏斜比例（如 999:1000）的下降从 O(深度) 变为 O(连分数系数个数)。
+    # 每批只记录末尾至多5个半收敛分数：同一批内误差单调递减，
+    # 被跳过的项在本批内至少有5个更优者，必然进不了前5。
+    # 整数部分 q 直接定位，避免在树顶逐步右移
+    q = a // b
+    if q >= 1:
+        record(q, 1)
+    record(q + 1, 1)
+    lo_n, lo_d = q, 1        # 始终位于 target 下方
+    hi_n, hi_d = q + 1, 1    # 始终位于 target 上方
+
+    while True:
+        # 整数化的上下界偏差：L = target-lo、H = hi-target（同乘 lo_d*b 等比例）
+        L = lo_d * a - lo_n * b
+        H = hi_n * b - hi_d * a
+        if H > L:
+            # 向左批量下降：hi 朝 lo 方向连走 k 步
+            k = min(H // L, (max_den - hi_d) // lo_d)
+            if k == 0:
+                break  # 下一个中位分数的分母已超出上限
+            for j in range(max(1, k - 4), k + 1):
+                record(lo_n * j + hi_n, lo_d * j + hi_d)
+            hi_n += lo_n * k
+            hi_d += lo_d * k
+            if k < H // L or H == k * L:
+                break  # 被分母上限截断，或末步正中 target
+        elif L > H:
+            # 向右批量下降：lo 朝 hi 方向连走 k 步
+            k = min(L // H, (max_den - lo_d) // hi_d)
+            if k == 0:
+                break
+            for j in range(max(1, k - 4), k + 1):
+                record(lo_n + hi_n * j, lo_d + hi_d * j)
+            lo_n += hi_n * k
+            lo_d += hi_d * k
+            if k < L // H or L == k * H:
+                break
+        else:
+            # H == L：中位分数正中 target
+            if lo_d + hi_d <= max_den:
+                record(lo_n + hi_n, lo_d + hi_d)
+            break
+
+    # 按误差取前5：对下标做部分排序，排序键用精确分数 cross/den
+    # （即 |num/den - target| 的整数化形式，分母上公共的 b 可约去），
+    # 避免浮点舍入造成的并列误判；键表建好后用 C 实现的
+    # __getitem__ 作为 key，省去每次比较的 Python 层 lambda 调用
+    keys = [Fraction(crosses[i], dens[i]) for i in range(cnt)]
+    idx = heapq.nsmallest(5, range(cnt), key=keys.__getitem__)
+    # 对外仍是 (num, den, err) 三元组（转为元组，保证缓存的返回值不可变）
+    top5_out = tuple((nums[i], dens[i], errs[i]) for i in idx)
+
+    # 在预排序的一位数网格里二分出离 target 最近的一项，
+    # 再用精确键比较左右两个邻居
+    i = bisect.bisect_left(_SD_VALUES, target)
+    best_single_digit = None
+    best_key = None
+    for j in (i - 1, i):
+        if 0 <= j < len(_SD_TABLE):
+            n, d = _SD_TABLE[j]
+            cross = abs(n * b - d * a)
+            key = Fraction(cross, d)
+            if best_key is None or key < best_key:
+                best_key = key
+                best_single_digit = (n, d, cross / (d * b), cross)
 
-    # 按误差排序
-    candidates.sort(key=lambda x: x[2])
-    
-    # 如果没有一位数候选，直接返回前5个
-    if not single_digit_candidates:
-        return None, candidates[:5]
-    
-    # 找到误差最小的一位数比例
-    single_digit_candidates.sort(key=lambda x: x[2])
-    best_single_digit = single_digit_candidates[0]
-    
     # 判断是否需要特殊处理：误差在阈值内且不是全局最优
     if best_single_digit[2] < SINGLE_DIGIT_THRESHOLD:
         # 检查它是否是全局最优（分子分母完全相同）
         is_global_best = False
-        if candidates and best_single_digit[0] == candidates[0][0] and best_single_digit[1] == candidates[0][1]:
+        if best_single_digit[0] == top5_out[0][0] and best_single_digit[1] == top5_out[0][1]:
             is_global_best = True
-        
+
         if not is_global_best:
-            return best_single_digit, candidates[:5]
-    
-    return None, candidates[:5]
+            return best_single_digit[:3], top5_out
+
+    return None, top5_out
 
 # ---------- 3. 命令行模式 ----------
 def run_cli_mode():
@@ -295,8 +391,8 @@ if not USE_CLI:
             self.var_a = tk.StringVar()
             self.var_b = tk.StringVar()
             
-            # 验证函数：只允许输入数字
-            vcmd = (self.register(self.validate_input), '%P')
+            # 验证函数：只允许输入数字（%S=本次插入/删除的文本，%d=操作类型）
+            vcmd = (self.register(self.validate_input), '%S', '%d')
             
             # 文本框1
             self.entry_a = ttk.Entry(frm_in, textvariable=self.var_a, width=8, 
@@ -318,6 +414,10 @@ if not USE_CLI:
             self.text = tk.Text(self, width=27, height=12, wrap="word")
             self.text.pack(fill="both", expand=True, padx=8, pady=8)
 
+            # 记录上一次的输入和渲染文本，重复点击"运算"/重复回车时直接跳过
+            self._last_key = None
+            self._last_text = None
+
             # 绑定Enter键
             self.bind_all('<Return>', self.on_enter)
 
@@ -328,11 +428,11 @@ if not USE_CLI:
             if _config_warnings:
                 self.show_nonblocking_warning()
 
-        def validate_input(self, value):
-            """只允许输入空或数字"""
-            if value == "" or value.isdigit():
+        def validate_input(self, inserted, action):
+            """逐键校验：只检查本次插入的文本，删除操作一律放行"""
+            if action == '0':  # 删除
                 return True
-            return False
+            return inserted == "" or inserted.isdigit()
 
         def on_enter(self, event=None):
             """Enter键智能处理"""
@@ -377,15 +477,28 @@ if not USE_CLI:
             ttk.Button(btn_frame, text="啊？？", command=warn_window.destroy).pack(side="left", expand=True)
             ttk.Button(btn_frame, text="啊？？？", command=warn_window.destroy).pack(side="right")
 
+        def _render(self, new_text):
+            """一次性替换文本区内容；内容未变时连 Tk 重绘也省掉"""
+            if new_text == self._last_text:
+                return
+            self._last_text = new_text
+            # replace 是单次原子操作，避免 delete+insert 两次重建行索引
+            self.text.replace("1.0", "end", new_text)
+
         def calc(self):
             try:
                 a_str = self.var_a.get().strip()
                 b_str = self.var_b.get().strip()
-                
+
+                # 输入与上次完全相同：结果必然一致，跳过重算和文本重绘
+                key = (a_str, b_str)
+                if key == self._last_key:
+                    return
+                self._last_key = key
+
                 # 检查是否为空
                 if not a_str or not b_str:
-                    self.text.delete("1.0", "end")
-                    self.text.insert("end", "请输入两个正整数")
+                    self._render("请输入两个正整数")
                     return
                 
                 a = int(a_str)
@@ -393,8 +506,7 @@ if not USE_CLI:
                 
                 # 检查是否为正整数
                 if a <= 0 or b <= 0:
-                    self.text.delete("1.0", "end")
-                    self.text.insert("end", "请输入正整数（大于0）")
+                    self._render("请输入正整数（大于0）")
                     return
                     
                 # ========== ？？？？（？？？？？？？？？？？） ==========
@@ -409,13 +521,11 @@ if not USE_CLI:
                     lines.append("     误差=0")
                     lines.append("")
                     lines.append(EE_msg)
-                    self.text.delete("1.0", "end")
-                    self.text.insert("end", "\n".join(lines))
+                    self._render("\n".join(lines))
                     return
                     
             except ValueError:
-                self.text.delete("1.0", "end")
-                self.text.insert("end", "请输入有效的正整数")
+                self._render("请输入有效的正整数")
                 return
 
             lines = []
@@ -455,8 +565,7 @@ if not USE_CLI:
                     err_str = format_error(err)
                     lines.append(f"近似比例{i}【{num}:{den}】\n     误差{err_str}")
             
-            self.text.delete("1.0", "end")
-            self.text.insert("end", "\n".join(lines))
+            self._render("\n".join(lines))
 
         def minimize_console(self):
             """Windows下自动最小化CMD窗口"""